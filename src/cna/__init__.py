@@ -3,4 +3,6 @@
 """
 Constraint Network Analysis (CNA) Package.
 """
-# Version is managed in pyproject.toml and accessed via importlib.metadata
+# Version is managed in pyproject.toml and mirrored in cna/_version.py
+# The redundant alias marks __version__ as an explicit re-export
+from cna._version import __version__ as __version__
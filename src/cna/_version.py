@@ -0,0 +1,9 @@
+# src/cna/_version.py
+"""
+Static package version.
+
+Kept as a plain string literal so the CLI can report its version without
+importing importlib.metadata. Must match the version in pyproject.toml.
+"""
+
+__version__ = "0.1.0"
@@ -6,23 +6,50 @@ Handles argument parsing and initiates the analysis workflow.
 """
 
 import argparse
+import functools
 import logging
+import os
 import sys
-from importlib import metadata
-from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
-from cna.config import CNAConfig, load_default_config
+if TYPE_CHECKING:
+    # The config module is imported lazily in main(), after --version is handled
+    from cna.config import CNAConfig, OutputParams
 
 # Setup logger for this module - configuration will be done in main()
 logger = logging.getLogger(__name__)
 # Get the root logger instance to configure its level in main()
 # Ensures configuration affects handlers potentially added by pytest (caplog)
 root_logger = logging.getLogger()
+# Set once _configure_logging() has done its one-time setup
+_LOGGING_CONFIGURED = False
+# Formatter for CLI log output, created once per process
+_LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s [%(levelname)-8s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
 
 
+# Program name shown in usage and version output (the entry point name)
+_PROG = "cna-run"
+
+try:
+    # Static version string; avoids importing importlib.metadata at startup
+    from cna._version import __version__ as _VERSION
+except ImportError:
+    _VERSION = None
+
+
+@functools.lru_cache(maxsize=1)
 def _get_version() -> str:
-    """Retrieves the package version using importlib.metadata."""
+    """Retrieves the package version, falling back to importlib.metadata.
+
+    The result is cached, so the metadata lookup runs at most once per process.
+    """
+    if _VERSION is not None:
+        return _VERSION
+    # Only pay for the metadata lookup if the static version is unavailable
+    from importlib import metadata
     try:
         # Ensure this matches the package name used during installation (e.g., in pyproject.toml)
         return metadata.version("cna-py")
@@ -31,13 +58,175 @@ def _get_version() -> str:
         return "0.0.0-dev"
 
 
-def _build_parser(default_cfg: CNAConfig) -> argparse.ArgumentParser:
+class _LazyVersionAction(argparse.Action):
+    """Version action that resolves the version only when the flag is used."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS,
+                 default=argparse.SUPPRESS, help=None):
+        super().__init__(
+            option_strings=option_strings, dest=dest, default=default,
+            nargs=0, help=help,
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        sys.stdout.write(f"{parser.prog} {_get_version()}\n")
+        parser.exit()
+
+
+def _start_queue_logging() -> None:
+    """
+    Routes root log records to stderr through a background thread.
+
+    A QueueHandler on the root logger only enqueues records; a QueueListener
+    thread formats and writes them, so logging calls don't block on stderr.
+    The listener is stopped, flushing the queue, at interpreter exit.
+    """
+    # Imported here: logging.handlers pulls in socket and pickle, which would
+    # slow down every CLI start, including --help and --version
+    import atexit
+    import logging.handlers
+    import queue
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_LOG_FORMATTER)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def _configure_logging(level: Optional[int] = None) -> None:
+    """
+    Sets up CLI logging; only the first call per process does the full setup.
+
+    The first call installs the stderr pipeline (see _start_queue_logging)
+    unless the root logger already has handlers, e.g. from pytest's caplog or
+    an embedding application. Later calls only update the level.
+
+    Args:
+        level: Level for the root logger. None leaves the level unchanged.
+    """
+    global _LOGGING_CONFIGURED
+    if level is not None:
+        # Configure the *root* logger's level. This allows pytest's caplog to work.
+        root_logger.setLevel(level)
+    if _LOGGING_CONFIGURED:
+        return
+    if not root_logger.hasHandlers():
+        _start_queue_logging()
+    _LOGGING_CONFIGURED = True
+
+
+# Options taking a value that the fast parser handles (also used by
+# _version_requested), mapped to their dest
+_FAST_VALUE_OPTIONS = {"-i": "input", "--input": "input", "--res_dir": "res_dir"}
+
+
+def _is_fast_flag(token: str) -> bool:
+    """Checks whether token is a flag handled by _fast_parse (--stbmap, -v...)."""
+    return token in ("--stbmap", "--verbose") or (
+        len(token) > 1 and token[0] == "-" and token[1:] == "v" * (len(token) - 1)
+    )
+
+
+def _version_requested(argv: Sequence[str]) -> bool:
+    """
+    Checks whether argv asks for --version in a way the full parser accepts.
+
+    Used by main() to answer --version before the configuration is loaded.
+    Only a standalone '--version' token counts, and only if every token before
+    it is one _fast_parse() accepts. Anything else before it (--help, --opt=value,
+    abbreviations, unknown options, missing values or '--') is left to the full
+    parser, which may print help or an error instead of the version.
+
+    Args:
+        argv: The command-line arguments.
+
+    Returns:
+        True if the version should be printed.
+    """
+    tokens = iter(argv)
+    for token in tokens:
+        if token == "--version":
+            return True
+        if token in _FAST_VALUE_OPTIONS:
+            value = next(tokens, None)
+            if value is None or value.startswith("-"):
+                return False
+        elif not _is_fast_flag(token):
+            return False
+    return False
+
+
+def _fast_parse(argv: Sequence[str], default_cfg: "CNAConfig") -> Optional[argparse.Namespace]:
+    """
+    Parses plain CLI invocations without building the argparse parser.
+
+    Handles only the common option forms (-i/--input FILE, --res_dir DIR,
+    -v/-vv/--verbose, --stbmap) and produces the same Namespace as the full
+    parser. Anything else (--help, --version, --opt=value, abbreviations,
+    unknown or missing arguments) returns None, so that argparse handles it,
+    including help output and error messages.
+
+    Args:
+        argv: The command-line arguments.
+        default_cfg: The default configuration object.
+
+    Returns:
+        The parsed arguments, or None if the full parser must be used.
+    """
+    values = {
+        "input": None,
+        "res_dir": default_cfg.output.result_dir,
+        "verbose": default_cfg.output.verbosity_level,
+        "stbmap": False,
+    }
+    tokens = iter(argv)
+    for token in tokens:
+        dest = _FAST_VALUE_OPTIONS.get(token)
+        if dest is not None:
+            value = next(tokens, None)
+            if value is None or value.startswith("-"):
+                return None
+            values[dest] = value
+        elif not _is_fast_flag(token):
+            return None
+        elif token == "--stbmap":
+            values["stbmap"] = True
+        elif token == "--verbose":
+            values["verbose"] += 1
+        else:
+            values["verbose"] += len(token) - 1
+    if values["input"] is None:
+        return None
+    return argparse.Namespace(**values)
+
+
+def _build_parser(default_cfg: "CNAConfig") -> argparse.ArgumentParser:
     """
     Builds the argument parser for the CNA CLI.
 
+    The parser only depends on the output defaults and is cached per
+    OutputParams, so repeated calls return the same (shared) instance.
+
     Args:
         default_cfg: The default configuration object.
 
+    Returns:
+        An configured argparse.ArgumentParser instance. It must not be modified.
+    """
+    return _build_output_parser(default_cfg.output)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_output_parser(output_cfg: "OutputParams") -> argparse.ArgumentParser:
+    """
+    Builds the argument parser for the given output defaults (cached).
+
+    Args:
+        output_cfg: The output parameters used for argument defaults.
+
     Returns:
         An configured argparse.ArgumentParser instance.
     """
@@ -45,13 +234,12 @@ def _build_parser(default_cfg: CNAConfig) -> argparse.ArgumentParser:
         description="Constraint Network Analysis (CNA): Analyze biomolecular "
                     "flexibility and rigidity.",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-        prog="cna-run" # Match the intended entry point name
+        prog=_PROG
     )
 
     parser.add_argument(
         "--version",
-        action="version",
-        version=f"%(prog)s {_get_version()}", # Use dynamic version retrieval
+        action=_LazyVersionAction, # Version is only resolved if the flag is used
         help="Show program's version number and exit.",
     )
 
@@ -68,7 +256,7 @@ def _build_parser(default_cfg: CNAConfig) -> argparse.ArgumentParser:
         "--res_dir",
         type=str,
         # Set the default value displayed in help message from config
-        default=default_cfg.output.result_dir,
+        default=output_cfg.result_dir,
         metavar="DIR",
         help="Output results directory.",
     )
@@ -83,11 +271,11 @@ def _build_parser(default_cfg: CNAConfig) -> argparse.ArgumentParser:
         "--verbose",
         action="count",
         # Set the internal default count based on the config's level
-        default=default_cfg.output.verbosity_level,
+        default=output_cfg.verbosity_level,
         help=f"Increase output verbosity. No flag: Default level from config "
-             f"({logging.getLevelName(logging.WARNING + (10 * (1-default_cfg.output.verbosity_level))) if default_cfg.output.verbosity_level <= 1 else 'DEBUG'}), "
+             f"({logging.getLevelName(logging.WARNING + (10 * (1-output_cfg.verbosity_level))) if output_cfg.verbosity_level <= 1 else 'DEBUG'}), "
              f"-v: {logging.getLevelName(logging.INFO)}, -vv: {logging.getLevelName(logging.DEBUG)}. "
-             f"Default verbosity level set to {default_cfg.output.verbosity_level} in config.",
+             f"Default verbosity level set to {output_cfg.verbosity_level} in config.",
     )
 
     # Handle boolean flags like --stbmap correctly with config defaults
@@ -109,33 +297,40 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
     Main entry point for the CNA command-line interface.
 
     Parses arguments, sets up logging, and calls the appropriate workflow.
+    Returns normally on success and exits with a non-zero code on errors.
 
     Args:
         argv: Optional sequence of command-line arguments. If None, uses sys.argv[1:].
     """
-    # Basic logging setup in case of early errors (e.g., config loading)
-    # This might be overridden later but ensures early messages are seen.
-    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
-
     if argv is None:
         argv = sys.argv[1:] # Use command-line arguments if not provided directly
 
+    # Answer --version without loading the configuration or setting up logging
+    if _version_requested(argv):
+        sys.stdout.write(f"{_PROG} {_get_version()}\n")
+        sys.exit(0)
+
+    # Set up logging before anything else can fail (e.g., config loading)
+    _configure_logging()
+
     # Load default configuration first
+    from cna.config import load_default_config
     try:
         default_cfg = load_default_config()
     except Exception as e:
-        logger.error(f"Failed to load default configuration: {e}", exc_info=True)
+        logger.error("Failed to load default configuration: %s", e, exc_info=True)
         sys.exit(1)
 
-    # Build the parser using defaults for help messages
-    parser = _build_parser(default_cfg)
-
-    # Parse the arguments
-    try:
-        args = parser.parse_args(args=argv)
-    except SystemExit as e:
-        # Catch argparse exit (e.g., due to --help or errors) and exit gracefully
-        sys.exit(e.code)
+    # Parse the arguments, using argparse only if the fast path can't
+    args = _fast_parse(argv, default_cfg)
+    if args is None:
+        # Build the parser using defaults for help messages
+        parser = _build_parser(default_cfg)
+        try:
+            args = parser.parse_args(args=argv)
+        except SystemExit as e:
+            # Catch argparse exit (e.g., due to --help or errors) and exit gracefully
+            sys.exit(e.code)
 
     # --- Configure Logging based on verbosity ---
     # Map verbosity count to logging levels. The 'count' action adds to the default.
@@ -149,31 +344,15 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
     elif args.verbose >= 2:
         log_level = logging.DEBUG
 
-    # Configure the *root* logger's level. This allows pytest's caplog to work.
-    root_logger.setLevel(log_level)
-
-    # Define a standard formatter
-    log_formatter = logging.Formatter(
-         "%(asctime)s [%(levelname)-8s] %(name)s: %(message)s",
-         datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    # Ensure there's at least one handler (e.g., for stdout/stderr)
-    # and apply the formatter. If pytest is running, caplog adds handlers.
-    if not root_logger.hasHandlers():
-         # Add a default handler if running standalone (not via pytest)
-         stream_handler = logging.StreamHandler(sys.stderr)
-         root_logger.addHandler(stream_handler)
-
-    # Apply the formatter to all existing handlers
-    for handler in root_logger.handlers:
-         handler.setFormatter(log_formatter)
+    _configure_logging(log_level)
 
     # --- Log startup messages ---
-    logger.info(f"Starting CNA v{_get_version()}")
-    logger.debug(f"Raw command line arguments: {argv}")
-    logger.debug(f"Parsed arguments: {args}")
-    logger.debug(f"Effective logging level: {logging.getLevelName(log_level)}")
-    logger.debug(f"Output directory set to: {args.res_dir}")
+    # %-style arguments are only formatted if the record is actually emitted
+    logger.info("Starting CNA v%s", _get_version())
+    logger.debug("Raw command line arguments: %s", argv)
+    logger.debug("Parsed arguments: %s", args)
+    logger.debug("Effective logging level: %s", logging.getLevelName(log_level))
+    logger.debug("Output directory set to: %s", args.res_dir)
 
     # Apply config default for stbmap *after* parsing if CLI flag wasn't used
     stbmap_enabled = args.stbmap or default_cfg.output.stbmap
@@ -184,24 +363,25 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
     # --- Process Paths and Check Existence ---
     logger.info("CLI parsing complete.")
     try:
-        input_path = Path(args.input)
-        if not input_path.is_file(): # Check if it's a file that exists
-             logger.error(f"Input is not a valid file: {input_path}")
+        # os.path.isfile skips pathlib's Python-level wrappers for this check
+        if not os.path.isfile(args.input): # Check if it's a file that exists
+             logger.error("Input is not a valid file: %s", args.input)
              sys.exit(1) # Exit if input file doesn't exist
 
-        output_dir = Path(args.res_dir)
-        # Create output directory if it doesn't exist
+        # Create output directory (and parents) if it doesn't exist
         try:
-            output_dir.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Ensured output directory exists: {output_dir.resolve()}")
+            os.makedirs(args.res_dir, exist_ok=True)
+            logger.debug("Ensured output directory exists: %s", args.res_dir)
         except OSError as e:
-            logger.error(f"Could not create output directory {output_dir}: {e}", exc_info=True)
+            logger.error("Could not create output directory %s: %s", args.res_dir, e, exc_info=True)
             sys.exit(1)
 
-        logger.info(f"Input structure: {input_path.resolve()}")
-        logger.info(f"Output directory: {output_dir.resolve()}")
+        # os.path.realpath resolves like Path.resolve() without importing pathlib
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Input structure: %s", os.path.realpath(args.input))
+            logger.info("Output directory: %s", os.path.realpath(args.res_dir))
     except Exception as e:
-        logger.error(f"Error processing file paths: {e}", exc_info=True)
+        logger.error("Error processing file paths: %s", e, exc_info=True)
         sys.exit(1)
 
 
@@ -212,8 +392,6 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
 
 
     logger.info("CNA run finished (placeholder).")
-    # Explicitly exit successfully if main completes without error
-    sys.exit(0)
 
 
 if __name__ == "__main__":
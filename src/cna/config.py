@@ -7,12 +7,64 @@ parameters using dataclasses, and provides default values based on legacy CNA.
 """
 
 import dataclasses
-from typing import List, Optional, Tuple
+import functools
+import numbers
+from typing import Any, Optional, Tuple, Union, get_args, get_origin, get_type_hints
 from dataclasses import field
 
+@functools.cache
+def _field_types(cls: type) -> Tuple[Tuple[str, Any], ...]:
+    """Returns the (name, resolved type hint) pairs of the init fields of cls."""
+    hints = get_type_hints(cls)
+    return tuple((f.name, hints[f.name]) for f in dataclasses.fields(cls) if f.init)
+
+def _matches_type(value: Any, tp: Any) -> bool:
+    """Checks value against the type hints used in this module."""
+    origin = get_origin(tp)
+    if origin is Union:
+        return any(_matches_type(value, arg) for arg in get_args(tp))
+    if origin is tuple:
+        args = get_args(tp)
+        if not isinstance(value, tuple):
+            return False
+        if len(args) == 2 and args[1] is Ellipsis:
+            return all(_matches_type(item, args[0]) for item in value)
+        return len(value) == len(args) and all(map(_matches_type, value, args))
+    if tp is type(None):
+        return value is None
+    # bool is a subclass of int, but a flag is never a valid number here
+    if isinstance(value, bool) and tp is not bool:
+        return False
+    # The numbers ABCs also cover NumPy scalars such as np.int64
+    if tp is float:
+        return isinstance(value, numbers.Real)
+    if tp is int:
+        return isinstance(value, numbers.Integral)
+    return isinstance(value, tp)
+
+def _validate_field_types(obj: Any) -> None:
+    """
+    Checks that all fields of a config dataclass match their annotations.
+
+    Raises:
+        TypeError: If a field holds a value of the wrong type.
+    """
+    for name, tp in _field_types(type(obj)):
+        value = getattr(obj, name)
+        if not _matches_type(value, tp):
+            type_name = tp.__name__ if isinstance(tp, type) else str(tp).replace("typing.", "")
+            raise TypeError(
+                f"{type(obj).__name__}.{name} must be {type_name}, "
+                f"not {type(value).__name__}: {value!r}"
+            )
+
 # Using frozen=True makes instances immutable after creation, which is
-# generally desirable for configuration objects.
-@dataclasses.dataclass(frozen=True)
+# generally desirable for configuration objects. slots=True drops the
+# per-instance __dict__, making instances smaller and attribute access faster.
+# Collection fields use tuples, which keeps the configs immutable and hashable.
+# Each class checks its field types on construction (see __post_init__), so a
+# bad value fails when the config is created rather than deep inside a run.
+@dataclasses.dataclass(frozen=True, slots=True)
 class SimulationParams:
     """Parameters controlling the simulation process."""
     e_stop: float = -7.0  # HB energy cutoff stop value (kcal/mol) [Original: E_STOP]
@@ -24,7 +76,10 @@ class SimulationParams:
     fnc_steps: int = 100 # Number of network topologies for FNC ensemble [Original: F_STEPS]
     cores: int = 1 # Number of CPU cores to use for parallel processing [Original: CORES]
 
-@dataclasses.dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        _validate_field_types(self)
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class ConstraintParams:
     """Parameters defining how constraints are generated."""
     hp_fxn: int = 1 # Method for placing hydrophobic tethers (0, 1, 2, 3) [Original: HP_FXN]
@@ -36,7 +91,10 @@ class ConstraintParams:
     # NOTE: Logic to select between c_cutoff_const and c_cutoff_range based on
     # SimulationParams.tus_type will be handled during constraint generation.
 
-@dataclasses.dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        _validate_field_types(self)
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class AnalysisParams:
     """Parameters controlling post-simulation analysis."""
     # Cutoff for considering residues with dG_i,CNA > value [Original: CUT]
@@ -46,7 +104,7 @@ class AnalysisParams:
     # Minimum size of a cluster to be considered percolated [Original: MIN_CLUSTER_SIZE_PERCOLATED]
     min_cluster_size_percolated: int = 30
     # Methods for phase transition detection [Original: TRANSITION_SOURCE]
-    transition_source: List[str] = field(default_factory=lambda: ["cce2_sigmoid", "cce2_spline"])
+    transition_source: Tuple[str, ...] = ("cce2_sigmoid", "cce2_spline")
     # Cutoff distance for unfolding nuclei identification type 4 [Original: NEIGHBOR_CUTOFF_UNF]
     neighbor_cutoff_unfolding: float = 5.0
     # Akaike information criteria for transition fitting [Original: --aic]
@@ -56,9 +114,12 @@ class AnalysisParams:
     # 2: All rigid clusters (>= min_cluster_size_percolated) becoming flexible
     # 3: Residues making critical hydrogen bonds breaking
     # 4: Residues around critical hydrogen bond atoms (within neighbor_cutoff_unfolding)
-    unfolding_nuclei_types: Optional[List[int]] = None # e.g., [1, 2, 3, 4] if specified
+    unfolding_nuclei_types: Optional[Tuple[int, ...]] = None # e.g., (1, 2, 3, 4) if specified
+
+    def __post_init__(self) -> None:
+        _validate_field_types(self)
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class OutputParams:
     """Parameters controlling output generation."""
     result_dir: str = "results" # Name of the results directory [Original: --res_dir]
@@ -68,7 +129,10 @@ class OutputParams:
     all_results: bool = False
     verbosity_level: int = 1 # Verbosity level (0-3) [Original: --verbose]
 
-@dataclasses.dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        _validate_field_types(self)
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class CNAConfig:
     """Main configuration object holding parameters for a CNA run."""
     simulation: SimulationParams = field(default_factory=SimulationParams)
@@ -79,10 +143,17 @@ class CNAConfig:
     # Potentially add top-level flags if they don't fit neatly elsewhere
     # web_interface_mode: bool = False # Example if needed later
 
+    def __post_init__(self) -> None:
+        _validate_field_types(self)
+
+@functools.cache
 def load_default_config() -> CNAConfig:
     """
     Instantiates and returns the default CNA configuration settings.
 
+    The configuration is immutable, so a single cached instance is shared
+    between all callers.
+
     Returns:
         An immutable CNAConfig object populated with default parameter values.
     """
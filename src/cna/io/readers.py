@@ -1,60 +1,236 @@
+import functools
+import io
 import logging
+import os
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, BinaryIO, Optional, Union
 
-import biotite.structure as struc
-import biotite.structure.io as strucio
-from biotite.structure.error import BadStructureError
+if TYPE_CHECKING:
+    # Biotite is imported lazily in load_structure to keep CLI startup light
+    import biotite.structure as struc
 
 # Setup logger for this module
 logger = logging.getLogger(__name__)
 
-def load_structure(file_path: Union[str, Path]) -> struc.AtomArray:
+# BinaryCIF files larger than this are decoded from a memory map
+_MMAP_THRESHOLD_BYTES = 50 * 1024**2
+
+def _read_binary_cif_mapped(file_path: Path):
+    """
+    Reads a BinaryCIF file by decoding a read-only memory map of it.
+
+    MessagePack decodes directly from the mapped pages, so no copy of the whole
+    file is held in memory as a bytes object during parsing.
+
+    Args:
+        file_path: The path to the BinaryCIF file.
+
+    Returns:
+        A biotite.structure.io.pdbx.BinaryCIFFile.
+    """
+    import mmap
+
+    import msgpack  # Installed as a Biotite dependency
+    from biotite.structure.io import pdbx
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return pdbx.BinaryCIFFile.deserialize(
+            msgpack.unpackb(mapped, use_list=True, raw=False)
+        )
+
+def _ensure_float32_coords(atom_array: "struc.AtomArray") -> None:
+    """
+    Stores the coordinates of atom_array as a C-contiguous float32 array.
+
+    Downstream kernels rely on this layout. Biotite normally provides it
+    already, in which case the array is kept as is and nothing is copied.
+    """
+    import numpy as np
+
+    atom_array.coord = np.ascontiguousarray(atom_array.coord, dtype=np.float32)
+
+def _prefer_binary_cif(file_path: Path) -> Path:
+    """
+    Returns an up-to-date BinaryCIF sibling of an mmCIF file, if one exists.
+
+    BinaryCIF holds the same data as mmCIF but is much smaller and faster to
+    parse. The sibling (same name, '.bcif' suffix) is only used if it is at
+    least as new as the given file, so edits to the text file are not ignored.
+
+    Args:
+        file_path: The path to an existing structure file.
+
+    Returns:
+        The path of the BinaryCIF sibling, or file_path unchanged.
+    """
+    if file_path.suffix.lower() not in (".cif", ".pdbx"):
+        return file_path
+    bcif_path = file_path.with_suffix(".bcif")
+    try:
+        if bcif_path.stat().st_mtime < file_path.stat().st_mtime:
+            return file_path
+    except OSError:
+        # No (accessible) BinaryCIF sibling
+        return file_path
+    logger.info("Using BinaryCIF file %s instead of %s.", bcif_path, file_path)
+    return bcif_path
+
+@functools.cache
+def _pdb_file_class():
+    """
+    Returns the PDBFile class used to parse PDB files.
+
+    This is fastpdb's drop-in replacement of Biotite's PDBFile, which parses
+    with compiled code, if the optional fastpdb package is installed (the
+    'fast' extra). Otherwise, Biotite's own PDBFile is used.
+    """
+    try:
+        import fastpdb
+    except ImportError:
+        from biotite.structure.io.pdb import PDBFile
+        return PDBFile
+    return fastpdb.PDBFile
+
+def _read_text_file(file_class, source: Union[Path, BinaryIO]):
+    """
+    Reads a text-based Biotite file (e.g. PDBFile) from a path or binary stream.
+
+    Binary streams are decoded on the fly, without reading them into a
+    separate bytes object first.
+    """
+    if isinstance(source, Path):
+        return file_class.read(str(source))
+    text = io.TextIOWrapper(source, encoding="utf-8")
+    try:
+        return file_class.read(text)
+    finally:
+        # Leave the caller's stream open (closing the wrapper would close it)
+        text.detach()
+
+def _load_pdb(source: Union[Path, BinaryIO]):
+    """Parses the first model of a PDB file; returns it and the model count."""
+    pdb_file = _read_text_file(_pdb_file_class(), source)
+    return pdb_file.get_structure(model=1), pdb_file.get_model_count()
+
+def _load_cif(source: Union[Path, BinaryIO]):
+    """Parses the first model of an mmCIF file; returns it and the model count."""
+    from biotite.structure.io import pdbx
+
+    cif_file = _read_text_file(pdbx.CIFFile, source)
+    return pdbx.get_structure(cif_file, model=1), pdbx.get_model_count(cif_file)
+
+def _load_bcif(source: Union[Path, BinaryIO]):
+    """Parses the first model of a BinaryCIF file; returns it and the model count."""
+    from biotite.structure.io import pdbx
+
+    if isinstance(source, Path) and source.stat().st_size > _MMAP_THRESHOLD_BYTES:
+        cif_file = _read_binary_cif_mapped(source)
+    elif isinstance(source, Path):
+        cif_file = pdbx.BinaryCIFFile.read(str(source))
+    else:
+        cif_file = pdbx.BinaryCIFFile.read(source)
+    return pdbx.get_structure(cif_file, model=1), pdbx.get_model_count(cif_file)
+
+def _load_generic(file_path: Path):
+    """
+    Parses any other format supported by Biotite's load_structure.
+
+    Biotite detects the file type itself; currently supports e.g.:
+    .pdbqt, .gro, .mol2, .sdf, .trr, .xtc, .dcd, .netcdf
+    Multiple models are returned as an AtomArrayStack, so the model count is
+    reported as 1 here.
+    """
+    import biotite.structure.io as strucio
+
+    return strucio.load_structure(str(file_path)), 1
+
+# Dedicated loaders by (lower-case) file suffix. For these formats only the
+# first model is parsed, instead of building a full AtomArrayStack and
+# discarding all but one model. Other suffixes use _load_generic, which needs
+# a file path; file objects are only supported for the formats listed here.
+_LOADERS = {
+    ".pdb": _load_pdb,
+    ".cif": _load_cif,
+    ".pdbx": _load_cif,
+    ".bcif": _load_bcif,
+}
+
+def load_structure(
+    file_path: Union[str, Path, BinaryIO], file_format: Optional[str] = None
+) -> "struc.AtomArray":
     """
     Loads a molecular structure from a PDB or mmCIF file.
 
     This function utilizes Biotite to parse the structure file. If the file
     contains multiple models (as an AtomArrayStack), only the first model
-    is extracted and returned as an AtomArray.
+    is extracted and returned as an AtomArray. For mmCIF files, an up-to-date
+    BinaryCIF file with the same name ('.bcif' suffix) is read instead.
 
     Args:
         file_path: The path to the PDB or mmCIF file. The path can be
-            provided as a string or a Path object.
+            provided as a string or a Path object. Alternatively, an open
+            binary file object (e.g. io.BytesIO) can be given, in which case
+            file_format is required.
+        file_format: The format of the file ('pdb', 'cif', 'pdbx' or 'bcif').
+            By default, it is derived from the file suffix.
 
     Returns:
-        A biotite.AtomArray representing the first model in the structure file.
+        A biotite.AtomArray representing the first model in the structure file,
+        with its coordinates stored as a C-contiguous float32 array.
 
     Raises:
         FileNotFoundError: If the specified file does not exist at the given path.
         ValueError: If the file cannot be parsed by Biotite, is an unknown
-            format, or if an unexpected structure type is loaded.
+            format, or if an unexpected structure type is loaded. Also if a
+            file object is given without a supported file_format.
         BadStructureError: If Biotite encounters inconsistencies or errors
             within the structure of the file.
     """
-    file_path = Path(file_path)
-    if not file_path.is_file():
-        raise FileNotFoundError(f"Structure file not found: {file_path}")
+    if isinstance(file_path, (str, os.PathLike)):
+        file_path = Path(file_path)
+        if not file_path.is_file():
+            raise FileNotFoundError(f"Structure file not found: {file_path}")
+        if file_format is None:
+            file_path = _prefer_binary_cif(file_path)
+            file_format = file_path.suffix
+    elif file_format is None:
+        raise ValueError("file_format must be given when reading from a file object")
+    suffix = "." + file_format.lower().lstrip(".")
+    if not isinstance(file_path, Path) and suffix not in _LOADERS:
+        raise ValueError(f"Unsupported format for file objects: {file_format!r}")
+
+    import biotite.structure as struc
+    from biotite.structure.error import BadStructureError
 
     # Try-except block to handle potential parsing errors when loading the structure
     try:
-        # Biotite's load_structure handles file type detection; currently supports:
-        # .pdb, .pdbqt, .cif, .pdbx, .bcif, .gro, .mol2, .sdf, .trr, .xtc, .dcd, .netcdf
-        # and can return AtomArray or AtomArrayStack
-        structure = strucio.load_structure(str(file_path))
+        loader = _LOADERS.get(suffix, _load_generic)
+        structure, model_count = loader(file_path)
 
         # If the structure only has one model, it should be an AtomArray, so we can return it directly
         if isinstance(structure, struc.AtomArray):
-            logger.info(f"Loaded structure with {len(structure)} atoms from {file_path}.")
+            if model_count > 1:
+                logger.warning(
+                    "File %s contains multiple models (%d). Using the first model only.",
+                    file_path, model_count
+                )
+                logger.info("Loaded first model with %d atoms from %s.", len(structure), file_path)
+            else:
+                logger.info("Loaded structure with %d atoms from %s.", len(structure), file_path)
+            _ensure_float32_coords(structure)
             return structure
         # If the structure has multiple models, we extract the first one and log a warning
         elif isinstance(structure, struc.AtomArrayStack):
             if structure.stack_depth() > 1:
                 logger.warning(
-                    f"File {file_path} contains multiple models ({structure.stack_depth()}). "
-                    f"Using the first model only."
+                    "File %s contains multiple models (%d). Using the first model only.",
+                    file_path, structure.stack_depth()
                 )
-            first_model = structure[0]
-            logger.info(f"Loaded first model with {len(first_model)} atoms from {file_path}.")
+            # get_array() shares the annotation arrays with the stack and only
+            # slices the coordinates, so no per-atom annotations are copied
+            first_model = structure.get_array(0)
+            logger.info("Loaded first model with %d atoms from %s.", len(first_model), file_path)
+            _ensure_float32_coords(first_model)
             return first_model
         else:
             # This case should never happen if an expected file type (see above) is provided
@@ -67,10 +243,10 @@ def load_structure(file_path: Union[str, Path]) -> struc.AtomArray:
     except BadStructureError as e:
         # This is biotite's specific error for structural inconsistencies
         # TODO: write a test that raises this error
-        logger.error(f"Biotite structural error parsing {file_path}: {e}")
+        logger.error("Biotite structural error parsing %s: %s", file_path, e)
         raise BadStructureError(f"Biotite structural error parsing {file_path}: {e}") from e
     except Exception as e:
         # Catch other potential Biotite/IO errors during parsing
         # TODO: write a test that raises this error
-        logger.error(f"Failed to parse structure file {file_path}: {e}")
+        logger.error("Failed to parse structure file %s: %s", file_path, e)
         raise ValueError(f"Failed to parse structure file {file_path}: {e}") from e
\ No newline at end of file
@@ -1,7 +1,64 @@
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
 import numpy as np
 import numpy.typing as npt
 import biotite.structure as struc
 
+# Fixed codes for common elements (Biotite's upper-case symbols), so that the
+# same element has the same code in every MolecularSystem. Elements not listed
+# here get system-specific codes following these.
+_ELEMENT_CODES: Dict[str, int] = {
+    "C": 0, "N": 1, "O": 2, "S": 3, "H": 4, "P": 5, "SE": 6,
+    "NA": 7, "K": 8, "MG": 9, "CA": 10, "MN": 11, "FE": 12, "CO": 13,
+    "NI": 14, "CU": 15, "ZN": 16, "F": 17, "CL": 18, "BR": 19, "I": 20,
+}
+
+
+def _pack_elements(
+    elements: npt.NDArray[np.str_],
+) -> Tuple[npt.NDArray[np.int8], Dict[str, int]]:
+    """Encode element symbols as int8 codes based on `_ELEMENT_CODES`.
+
+    Returns:
+        The per-atom codes and the symbol-to-code lookup, which extends
+        `_ELEMENT_CODES` with any unlisted elements present in the input.
+
+    Raises:
+        ValueError: If the codes do not fit into int8.
+    """
+    lookup = dict(_ELEMENT_CODES)
+    unique_elements, inverse = np.unique(elements, return_inverse=True)
+    codes = [lookup.setdefault(str(element), len(lookup)) for element in unique_elements]
+    if len(lookup) - 1 > np.iinfo(np.int8).max:
+        raise ValueError(
+            f"Too many distinct elements to encode as int8 ({len(lookup)} codes)"
+        )
+    table = np.array(codes, dtype=np.int8)
+    return table[inverse], lookup
+
+
+def _pack_names(
+    atom_names: npt.NDArray[np.str_],
+) -> Tuple[npt.NDArray[np.int16], Dict[str, int]]:
+    """Encode atom names as int16 codes (indices into the sorted unique names).
+
+    Returns:
+        The per-atom codes and the name-to-code lookup.
+
+    Raises:
+        ValueError: If there are more distinct names than int16 codes.
+    """
+    unique_names, inverse = np.unique(atom_names, return_inverse=True)
+    if len(unique_names) - 1 > np.iinfo(np.int16).max:
+        # astype() would silently wrap the codes around
+        raise ValueError(
+            f"Too many distinct atom names to encode as int16 ({len(unique_names)})"
+        )
+    lookup = {str(name): code for code, name in enumerate(unique_names)}
+    return inverse.astype(np.int16), lookup
+
+
 class MolecularSystem:
     """Represents a molecular system, wrapping a Biotite AtomArray.
 
@@ -10,6 +67,19 @@ class MolecularSystem:
     provided AtomArray represents a single structural model.
     """
 
+    # No per-instance __dict__: smaller instances and faster attribute access
+    __slots__ = (
+        "_atom_array",
+        "_coords",
+        "_coords_soa",
+        "_element_codes",
+        "_element_lookup",
+        "_name_codes",
+        "_name_lookup",
+        "_res_ids",
+        "_soa",
+    )
+
     def __init__(self, atom_array: struc.AtomArray) -> None:
         """Initializes the MolecularSystem with a Biotite AtomArray.
 
@@ -23,6 +93,27 @@ class MolecularSystem:
                 f"{type(atom_array).__name__}"
             )
         self._atom_array: struc.AtomArray = atom_array
+        # C-contiguous float32 coordinates for numeric kernels. This is a
+        # no-copy view when Biotite already stores them in that layout.
+        self._coords: npt.NDArray[np.float32] = np.ascontiguousarray(
+            atom_array.coord, dtype=np.float32
+        )
+        # (3, N) coordinate copy, built on first access (see coords_soa)
+        self._coords_soa: Optional[npt.NDArray[np.float32]] = None
+        # Integer-coded annotations for vectorized filtering. Comparing small
+        # integers is much cheaper than comparing NumPy string arrays.
+        self._element_codes, self._element_lookup = _pack_elements(atom_array.element)
+        self._name_codes, self._name_lookup = _pack_names(atom_array.atom_name)
+        self._res_ids: npt.NDArray[np.int32] = atom_array.res_id.astype(
+            np.int32, copy=False
+        )
+        # Packed per-atom arrays for analysis kernels (see the soa property)
+        self._soa: Mapping[str, np.ndarray] = MappingProxyType({
+            "xyz": self._coords,
+            "elem": self._element_codes,
+            "res": self._res_ids,
+            "name": self._name_codes,
+        })
 
     @property
     def atom_count(self) -> int:
@@ -33,13 +124,87 @@ class MolecularSystem:
     def coords(self) -> npt.NDArray[np.float32]:
         """The atomic coordinates of the system.
 
+        The array is C-contiguous float32 and is computed once at
+        construction, so repeated access does not convert or copy.
+
         Returns:
             A NumPy array of shape (N, 3) containing the atomic
             coordinates, where N is the number of atoms. Each row
             corresponds to an atom, and columns store the x, y, and z
             coordinates.
         """
-        return self._atom_array.coord
+        return self._coords
+
+    @property
+    def coords_soa(self) -> npt.NDArray[np.float32]:
+        """The atomic coordinates in structure-of-arrays layout.
+
+        A C-contiguous float32 array of shape (3, N), whose rows hold the x,
+        y and z coordinates of all atoms, so kernels can load each component
+        with unit stride. It is a copy of `coords`, made on first access and
+        cached; it does not reflect later in-place changes to `coords`.
+        """
+        if self._coords_soa is None:
+            self._coords_soa = np.ascontiguousarray(self._coords.T)
+        return self._coords_soa
+
+    @property
+    def soa(self) -> Mapping[str, np.ndarray]:
+        """Packed structure-of-arrays view of the per-atom data.
+
+        A read-only mapping of contiguous NumPy arrays, one entry per atom
+        each, meant to be passed to numeric kernels:
+
+        - "xyz": float32 coordinates of shape (N, 3) (same as `coords`)
+        - "elem": int8 element codes (same as `element_codes`)
+        - "res": int32 residue IDs (same as `res_ids`)
+        - "name": int16 atom name codes (same as `name_codes`)
+        """
+        return self._soa
+
+    @property
+    def element_codes(self) -> npt.NDArray[np.int8]:
+        """Per-atom integer codes of the element symbols.
+
+        Common elements have fixed codes shared by all systems. Use
+        `element_code()` to look up the code of a given element, e.g.
+        ``system.element_codes == system.element_code("C")`` selects all
+        carbon atoms.
+        """
+        return self._element_codes
+
+    @property
+    def name_codes(self) -> npt.NDArray[np.int16]:
+        """Per-atom integer codes of the atom names (see `name_code()`)."""
+        return self._name_codes
+
+    @property
+    def res_ids(self) -> npt.NDArray[np.int32]:
+        """Per-atom residue IDs as an int32 array."""
+        return self._res_ids
+
+    def element_code(self, element: str) -> int:
+        """Return the code of an element symbol in `element_codes`.
+
+        Args:
+            element: The upper-case element symbol, e.g. "C" or "FE".
+
+        Returns:
+            The integer code, or -1 if no atom in the system has this element,
+            so that comparisons against `element_codes` select nothing.
+        """
+        return self._element_lookup.get(element, -1)
+
+    def name_code(self, atom_name: str) -> int:
+        """Return the code of an atom name in `name_codes`.
+
+        Args:
+            atom_name: The atom name, e.g. "CA".
+
+        Returns:
+            The integer code, or -1 if no atom in the system has this name.
+        """
+        return self._name_lookup.get(atom_name, -1)
 
     @property
     def atom_array(self) -> struc.AtomArray:
@@ -0,0 +1,92 @@
+# tests/conftest.py
+"""
+Shared pytest fixtures for the CNA test suite.
+"""
+
+import contextlib
+import gc
+import mmap
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+import biotite.structure as struc
+
+from cna.io import readers
+from cna.structure.system import MolecularSystem
+
+# Define the path to the test data directory relative to this file. The paths
+# are resolved once here and shared with the test modules.
+TEST_DATA_DIR = (Path(__file__).parent / "data").resolve()
+TEST_PDB_FILE = TEST_DATA_DIR / "01_simple_helix.pdb"
+TEST_CIF_FILE = TEST_DATA_DIR / "01_simple_helix.cif"
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Disables the cyclic garbage collector for the duration of the block.
+
+    Parsing creates many short-lived objects, which would otherwise trigger
+    repeated collection passes that find nothing to free.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+@pytest.fixture(scope="session")
+def loaded_atom_array_pdb() -> struc.AtomArray:
+    """
+    Loads the test PDB file once for the whole test session.
+    """
+    try:
+        with _gc_paused():
+            return readers.load_structure(TEST_PDB_FILE)
+    except Exception as e:
+        pytest.fail(f"Fixture failed to load test PDB {TEST_PDB_FILE}: {e}")
+
+@pytest.fixture(scope="session")
+def test_pdb_bytes() -> Iterator[mmap.mmap]:
+    """
+    Read-only memory map of the test PDB file, shared for the whole session.
+
+    Wrap it in io.BytesIO to pass it to readers.load_structure().
+    """
+    with open(TEST_PDB_FILE, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+@pytest.fixture(scope="session")
+def loaded_atom_array_cif() -> struc.AtomArray:
+    """
+    Loads the test CIF file once for the whole test session.
+    """
+    try:
+        with _gc_paused():
+            return readers.load_structure(TEST_CIF_FILE)
+    except Exception as e:
+        pytest.fail(f"Fixture failed to load test CIF {TEST_CIF_FILE}: {e}")
+
+@pytest.fixture(scope="module")
+def system_pdb(loaded_atom_array_pdb: struc.AtomArray) -> MolecularSystem:
+    """
+    MolecularSystem of the test PDB structure, shared within a test module.
+    """
+    return MolecularSystem(loaded_atom_array_pdb)
+
+@pytest.fixture(scope="module")
+def system_cif(loaded_atom_array_cif: struc.AtomArray) -> MolecularSystem:
+    """
+    MolecularSystem of the test CIF structure, shared within a test module.
+    """
+    return MolecularSystem(loaded_atom_array_cif)
+
+@pytest.fixture(scope="session")
+def dummy_stack(loaded_atom_array_pdb: struc.AtomArray) -> struc.AtomArrayStack:
+    """
+    Two-model AtomArrayStack of the test PDB structure, built once per session.
+    """
+    return struc.stack([loaded_atom_array_pdb, loaded_atom_array_pdb])
@@ -5,43 +5,53 @@ Unit tests for the cna.cli module.
 """
 
 import argparse
+import dataclasses
+import functools
 import logging
+import os
+import subprocess
+import sys
 from pathlib import Path
-# Mock importlib.metadata if the package isn't installed during testing
+# Mock the version lookup so tests don't depend on the installed version
 from unittest.mock import patch
 
 import pytest
 
 from cna import cli, config
 
-# Load default config once for all tests in this module
-DEFAULT_CFG = config.load_default_config()
-# Define a dummy version for tests where the package might not be installed
+@functools.cache
+def _default_cfg() -> config.CNAConfig:
+    """Default config, loaded on first use rather than at collection time."""
+    return config.load_default_config()
+
+# Define a dummy version so tests don't depend on the installed version
 DUMMY_VERSION = "0.1.0-test"
 
-@pytest.fixture(autouse=True)
-def mock_metadata_version():
-    """Fixture to automatically mock importlib.metadata.version."""
-    # Use the package name defined in cli._get_version
-    package_name = "cna-py"
-    with patch('importlib.metadata.version', return_value=DUMMY_VERSION) as mock_ver:
+@pytest.fixture
+def mock_version():
+    """Fixture to mock cli._get_version; requested only by tests that need it."""
+    with patch.object(cli, '_get_version', return_value=DUMMY_VERSION) as mock_ver:
         yield mock_ver
 
-def test_cli_basic_required_args(mock_metadata_version):
+def test_cli_basic_required_args(mock_version):
     """Test parsing with only the required input argument."""
-    parser = cli._build_parser(DEFAULT_CFG)
+    default_cfg = _default_cfg()
+    parser = cli._build_parser(default_cfg)
     cmd_args = ['-i', 'input.pdb']
     args = parser.parse_args(cmd_args)
 
     assert args.input == 'input.pdb'
     # Check defaults for optional arguments
-    assert args.res_dir == DEFAULT_CFG.output.result_dir
-    assert args.verbose == DEFAULT_CFG.output.verbosity_level
+    assert args.res_dir == default_cfg.output.result_dir
+    assert args.verbose == default_cfg.output.verbosity_level
     assert args.stbmap is False # Default for stbmap in config is False
+    # The version is only resolved when --version is actually given
+    mock_version.assert_not_called()
 
-def test_cli_with_optional_args(mock_metadata_version):
+def test_cli_with_optional_args():
     """Test parsing with several optional arguments provided."""
-    parser = cli._build_parser(DEFAULT_CFG)
+    default_cfg = _default_cfg()
+    parser = cli._build_parser(default_cfg)
     test_output_dir = "custom_output"
     cmd_args = [
         '--input', 'structure.cif',
@@ -55,27 +65,67 @@ def test_cli_with_optional_args(mock_metadata_version):
     assert args.res_dir == test_output_dir
     assert args.stbmap is True
     # argparse adds counts to the default value provided
-    assert args.verbose == DEFAULT_CFG.output.verbosity_level + 2
+    assert args.verbose == default_cfg.output.verbosity_level + 2
 
-def test_cli_verbosity_levels(mock_metadata_version):
+def test_cli_verbosity_levels():
     """Test different verbosity levels using -v flags."""
-    parser = cli._build_parser(DEFAULT_CFG)
+    default_cfg = _default_cfg()
+    parser = cli._build_parser(default_cfg)
 
     # No verbosity flag -> should use default from config
     args_default = parser.parse_args(['-i', 'f.pdb'])
-    assert args_default.verbose == DEFAULT_CFG.output.verbosity_level
+    assert args_default.verbose == default_cfg.output.verbosity_level
 
     # -v -> default + 1
     args_v1 = parser.parse_args(['-i', 'f.pdb', '-v'])
-    assert args_v1.verbose == DEFAULT_CFG.output.verbosity_level + 1
+    assert args_v1.verbose == default_cfg.output.verbosity_level + 1
 
     # -vvv -> default + 3
     args_v3 = parser.parse_args(['-i', 'f.pdb', '-vvv'])
-    assert args_v3.verbose == DEFAULT_CFG.output.verbosity_level + 3
+    assert args_v3.verbose == default_cfg.output.verbosity_level + 3
+
+def test_cli_parser_is_cached():
+    """Test that parsers are reused for equal output defaults."""
+    default_cfg = _default_cfg()
+    parser = cli._build_parser(default_cfg)
+    assert cli._build_parser(default_cfg) is parser
+
+    custom_cfg = dataclasses.replace(
+        default_cfg, output=dataclasses.replace(default_cfg.output, result_dir="custom")
+    )
+    custom_parser = cli._build_parser(custom_cfg)
+    assert custom_parser is not parser
+    assert custom_parser.parse_args(['-i', 'f.pdb']).res_dir == "custom"
 
-def test_cli_missing_required_arg(mock_metadata_version):
+@pytest.mark.parametrize("cmd_args", [
+    ['-i', 'in.pdb'],
+    ['--input', 'in.pdb', '--res_dir', 'out', '--stbmap'],
+    ['-v', '-i', 'in.pdb', '-vv', '--verbose'],
+    ['-i', 'first.pdb', '-i', 'second.pdb'],
+])
+def test_fast_parse_matches_argparse(cmd_args):
+    """Test that the fast parser produces the same result as argparse."""
+    default_cfg = _default_cfg()
+    parser = cli._build_parser(default_cfg)
+    assert cli._fast_parse(cmd_args, default_cfg) == parser.parse_args(cmd_args)
+
+@pytest.mark.parametrize("cmd_args", [
+    [],
+    ['--res_dir', 'out'],
+    ['-i'],
+    ['-i', '--stbmap'],
+    ['--input=in.pdb'],
+    ['-i', 'in.pdb', '--res', 'out'],
+    ['-i', 'in.pdb', '--help'],
+    ['-i', 'in.pdb', '--nonexistent-option'],
+])
+def test_fast_parse_falls_back(cmd_args):
+    """Test that anything beyond the common option forms is left to argparse."""
+    assert cli._fast_parse(cmd_args, _default_cfg()) is None
+
+def test_cli_missing_required_arg():
     """Test that omitting the required -i argument causes SystemExit."""
-    parser = cli._build_parser(DEFAULT_CFG)
+    parser = cli._build_parser(_default_cfg())
     cmd_args = ['--res_dir', 'out'] # Missing -i/--input
 
     with pytest.raises(SystemExit) as excinfo:
@@ -83,29 +133,122 @@ def test_cli_missing_required_arg(mock_metadata_version):
     # Check that it exited with an error code (usually 2 for argparse errors)
     assert excinfo.value.code != 0
 
-def test_cli_invalid_arg(mock_metadata_version):
+def test_cli_invalid_arg():
     """Test that providing an unrecognized argument causes SystemExit."""
-    parser = cli._build_parser(DEFAULT_CFG)
+    parser = cli._build_parser(_default_cfg())
     cmd_args = ['-i', 'in.pdb', '--nonexistent-option']
 
     with pytest.raises(SystemExit) as excinfo:
         parser.parse_args(cmd_args)
     assert excinfo.value.code != 0
 
-def test_cli_version_action(mock_metadata_version):
+def test_cli_version_action(mock_version, capsys):
     """Test that the --version flag triggers the version action and exits."""
-    parser = cli._build_parser(DEFAULT_CFG)
+    parser = cli._build_parser(_default_cfg())
     cmd_args = ['--version']
 
     with pytest.raises(SystemExit) as excinfo:
         parser.parse_args(cmd_args)
     # Version action typically exits with code 0
     assert excinfo.value.code == 0
+    assert capsys.readouterr().out == f"cna-run {DUMMY_VERSION}\n"
     # Check that the mock was called
-    mock_metadata_version.assert_called_once_with("cna-py")
+    mock_version.assert_called_once_with()
+
+def test_get_version_uses_static_version():
+    """Test that _get_version() returns the version from cna._version."""
+    from cna import _version
+    assert cli._get_version() == _version.__version__
 
+def test_static_version_matches_pyproject():
+    """Test that cna._version is kept in sync with the version in pyproject.toml."""
+    import tomllib
+    from cna import _version
+    pyproject = Path(__file__).resolve().parents[1] / "pyproject.toml"
+    with open(pyproject, "rb") as f:
+        project_version = tomllib.load(f)["tool"]["poetry"]["version"]
+    assert _version.__version__ == project_version
+
+def test_cli_import_avoids_heavy_modules():
+    """Test that importing cna.cli doesn't pull in heavy or unneeded modules."""
+    # Run in a fresh interpreter, since this process has them imported already.
+    # -S skips site, whose .pth handling may import pathlib on its own.
+    code = (
+        "import sys, cna.cli; "
+        "print(','.join(m for m in ('biotite', 'numpy', 'pathlib', 'logging.handlers') "
+        "if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-S", "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+    assert result.stdout.strip() == ""
+
+def test_main_logs_to_stderr_before_exit(tmp_path):
+    """Test that queued log records reach stderr when main() exits with an error."""
+    # Run in a fresh interpreter, so the real queue logging pipeline is used
+    missing_input = tmp_path / "missing.pdb"
+    code = f"from cna import cli; cli.main(['-i', {str(missing_input)!r}])"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+    assert result.returncode == 1
+    assert "Starting CNA v" in result.stderr
+    assert f"Input is not a valid file: {missing_input}" in result.stderr
+
+def test_main_version_skips_logging_setup(mock_version, capsys):
+    """Test that main() answers --version without starting the logging pipeline."""
+    with patch.object(cli, '_configure_logging') as mock_configure:
+        with pytest.raises(SystemExit) as excinfo:
+            cli.main(['--version'])
+    assert excinfo.value.code == 0
+    assert capsys.readouterr().out == f"cna-run {DUMMY_VERSION}\n"
+    mock_configure.assert_not_called()
 
-def test_main_function_entry_point(caplog, tmp_path, mock_metadata_version):
+def test_main_version_skips_config_loading(mock_version):
+    """Test that main() answers --version before loading the configuration."""
+    with patch.object(config, 'load_default_config') as mock_load:
+        with pytest.raises(SystemExit) as excinfo:
+            cli.main(['--version'])
+    assert excinfo.value.code == 0
+    mock_load.assert_not_called()
+
+@pytest.mark.parametrize("cmd_args, expected", [
+    (['--version'], True),
+    (['-i', 'in.pdb', '--version'], True),
+    (['--version', '-i'], True),
+    (['-i', '--version'], False),
+    (['--version=3'], False),
+    (['-i', 'in.pdb', '--', '--version'], False),
+    (['-h', '--version'], False),
+    (['--stbmap=1', '--version'], False),
+    (['--inp', '--version'], False),
+    (['-i', 'in.pdb', '-vv', '--stbmap', '--res_dir', 'out', '--version'], True),
+    (['-i', 'in.pdb'], False),
+])
+def test_version_requested(cmd_args, expected):
+    """Test that only a standalone --version token short-circuits main()."""
+    assert cli._version_requested(cmd_args) is expected
+
+@pytest.mark.parametrize("cmd_args, code, message", [
+    (['--version=3'], 2, "usage: cna-run [-h] [--version] -i FILE"),
+    (['-i', '--version'], 2, "expected one argument"),
+    (['--stbmap=1', '--version'], 2, "ignored explicit argument '1'"),
+    (['--inp', '--version'], 2, "expected one argument"),
+    (['-h', '--version'], 0, "show this help message and exit"),
+])
+def test_main_version_errors_use_full_parser(capsys, cmd_args, code, message):
+    """Test that --version after other options is left to the full parser."""
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(cmd_args)
+    assert excinfo.value.code == code
+    # argparse prints help to stdout and errors to stderr
+    captured = capsys.readouterr()
+    assert message in (captured.out if code == 0 else captured.err)
+
+
+def test_main_function_entry_point(caplog, tmp_path, mock_version):
     """Test the main() function execution path with basic arguments."""
     test_input = tmp_path / "input.pdb"
     test_input.touch() # Create a dummy input file
@@ -117,13 +260,14 @@ def test_main_function_entry_point(caplog, tmp_path, mock_metadata_version):
     # Capture logging output
     caplog.set_level(logging.DEBUG)
 
-    # Expect SystemExit(0) for a successful run that calls sys.exit(0)
-    with pytest.raises(SystemExit) as excinfo:
-        cli.main(test_argv)
-    assert excinfo.value.code == 0
+    # A successful run returns normally instead of raising SystemExit
+    assert cli.main(test_argv) is None
+
+    # Read the captured log once; caplog.text copies the whole output on each access
+    log_text = caplog.text
 
     # Check log messages (more robustly)
-    assert f"Starting CNA v{DUMMY_VERSION}" in caplog.text
+    assert f"Starting CNA v{DUMMY_VERSION}" in log_text
 
     # --- MODIFICATION START: Check for key parts instead of exact repr ---
     # Check that the "Parsed arguments" message exists at DEBUG level
@@ -134,22 +278,35 @@ def test_main_function_entry_point(caplog, tmp_path, mock_metadata_version):
 
     # Check for the key argument values within the captured text
     # Use repr() to handle potential backslash escaping issues on Windows paths
-    assert f"input={repr(str(test_input))}" in caplog.text
-    assert f"res_dir={repr(str(test_output))}" in caplog.text
-    expected_verbose_count = DEFAULT_CFG.output.verbosity_level + 1
-    assert f"verbose={expected_verbose_count}" in caplog.text
-    assert "stbmap=True" in caplog.text
+    assert f"input={repr(str(test_input))}" in log_text
+    assert f"res_dir={repr(str(test_output))}" in log_text
+    expected_verbose_count = _default_cfg().output.verbosity_level + 1
+    assert f"verbose={expected_verbose_count}" in log_text
+    assert "stbmap=True" in log_text
     # --- MODIFICATION END ---
 
     # Check other important logs
-    assert "Effective logging level: DEBUG" in caplog.text
-    assert "CLI parsing complete." in caplog.text
-    assert f"Input structure: {test_input.resolve()}" in caplog.text
-    assert f"Output directory: {test_output.resolve()}" in caplog.text
-    assert "Workflow execution would start here." in caplog.text
-    assert "CNA run finished" in caplog.text
-
-def test_main_function_handles_argparse_exit(caplog, mock_metadata_version):
+    assert "Effective logging level: DEBUG" in log_text
+    assert "CLI parsing complete." in log_text
+    assert f"Input structure: {test_input.resolve()}" in log_text
+    assert f"Output directory: {test_output.resolve()}" in log_text
+    assert "Workflow execution would start here." in log_text
+    assert "CNA run finished" in log_text
+
+def test_configure_logging_is_idempotent(monkeypatch):
+    """Test that only the first _configure_logging() call does the full setup."""
+    monkeypatch.setattr(cli, '_LOGGING_CONFIGURED', False)
+    monkeypatch.setattr(cli.root_logger, 'handlers', [])
+    monkeypatch.setattr(cli.root_logger, 'level', logging.WARNING)
+
+    with patch.object(cli, '_start_queue_logging') as mock_start:
+        cli._configure_logging(logging.INFO)
+        cli._configure_logging(logging.DEBUG)
+
+    mock_start.assert_called_once_with()
+    assert cli.root_logger.level == logging.DEBUG
+
+def test_main_function_handles_argparse_exit(caplog):
     """Test that main() catches SystemExit from argparse (e.g., --help)."""
     test_argv_help = ['--help']
     test_argv_error = ['--res_dir', 'out'] # Missing -i
@@ -3,9 +3,9 @@
 Unit tests for the CNA configuration module (cna.config).
 """
 
+import numpy as np
 import pytest
 import dataclasses
-from typing import Optional, List, Tuple
 
 # Import the items to be tested from src/cna/config.py
 from cna.config import (
@@ -33,89 +33,98 @@ def test_default_config_loading():
         # pylint: disable=assigning-non-slot # Pylint doesn't know about frozen dataclasses
         config.simulation.cores = 2 # type: ignore
 
-def test_default_simulation_params():
-    """Verify default values within the SimulationParams dataclass."""
-    config = load_default_config()
-    sim_params = config.simulation
-
-    assert sim_params.e_stop == -7.0
-    assert isinstance(sim_params.e_stop, float)
-
-    assert sim_params.e_start == -0.25
-    assert isinstance(sim_params.e_start, float)
-
-    assert sim_params.e_step is None
-    assert isinstance(sim_params.e_step, type(None)) # Check Optional type correctly defaults to None
-
-    assert sim_params.tus_type == 1
-    assert isinstance(sim_params.tus_type, int)
-
-    assert sim_params.fnc_steps == 100
-    assert isinstance(sim_params.fnc_steps, int)
-
-    assert sim_params.cores == 1
-    assert isinstance(sim_params.cores, int)
-
-def test_default_constraint_params():
-    """Verify default values within the ConstraintParams dataclass."""
-    config = load_default_config()
-    cons_params = config.constraints
-
-    assert cons_params.hp_fxn == 1
-    assert isinstance(cons_params.hp_fxn, int)
-
-    assert cons_params.c_cutoff_const == 0.25
-    assert isinstance(cons_params.c_cutoff_const, float)
-
-    assert cons_params.c_cutoff_range == (0.25, 0.35)
-    assert isinstance(cons_params.c_cutoff_range, tuple)
-    assert len(cons_params.c_cutoff_range) == 2
-    assert isinstance(cons_params.c_cutoff_range[0], float)
-    assert isinstance(cons_params.c_cutoff_range[1], float)
-
-def test_default_analysis_params():
-    """Verify default values within the AnalysisParams dataclass."""
-    config = load_default_config()
-    analysis_params = config.analysis
-
-    assert analysis_params.dG_cutoff == 0.2
-    assert isinstance(analysis_params.dG_cutoff, float)
-
-    assert analysis_params.native_contact_distance == 5.0
-    assert isinstance(analysis_params.native_contact_distance, float)
-
-    assert analysis_params.min_cluster_size_percolated == 30
-    assert isinstance(analysis_params.min_cluster_size_percolated, int)
-
-    assert analysis_params.transition_source == ["cce2_sigmoid", "cce2_spline"]
-    assert isinstance(analysis_params.transition_source, list)
-    assert all(isinstance(s, str) for s in analysis_params.transition_source)
-
-    assert analysis_params.neighbor_cutoff_unfolding == 5.0
-    assert isinstance(analysis_params.neighbor_cutoff_unfolding, float)
-
-    assert analysis_params.aic_selection is False
-    assert isinstance(analysis_params.aic_selection, bool)
+    # Verify slotted instances (slots=True) carry no per-instance __dict__
+    for params in (config, config.simulation, config.constraints, config.analysis, config.output):
+        assert not hasattr(params, "__dict__")
 
-    assert analysis_params.unfolding_nuclei_types is None
-    assert isinstance(analysis_params.unfolding_nuclei_types, type(None))
+def test_default_config_is_cached():
+    """Verify that load_default_config returns the same shared instance."""
+    assert load_default_config() is load_default_config()
 
-def test_default_output_params():
-    """Verify default values within the OutputParams dataclass."""
+def test_default_config_is_hashable():
+    """Verify that configs are hashable and equal configs hash equally."""
     config = load_default_config()
-    output_params = config.output
-
-    assert output_params.result_dir == "results"
-    assert isinstance(output_params.result_dir, str)
-
-    assert output_params.stbmap is False
-    assert isinstance(output_params.stbmap, bool)
-
-    assert output_params.netout is False
-    assert isinstance(output_params.netout, bool)
-
-    assert output_params.all_results is False
-    assert isinstance(output_params.all_results, bool)
-
-    assert output_params.verbosity_level == 1
-    assert isinstance(output_params.verbosity_level, int)
\ No newline at end of file
+    assert hash(config) == hash(CNAConfig())
+    assert {config: True}[CNAConfig()]
+
+# Expected defaults per parameter group, as found on load_default_config()
+DEFAULT_PARAMS = [
+    ("simulation", SimulationParams, {
+        "e_stop": -7.0,
+        "e_start": -0.25,
+        "e_step": None,
+        "tus_type": 1,
+        "fnc_steps": 100,
+        "cores": 1,
+    }),
+    ("constraints", ConstraintParams, {
+        "hp_fxn": 1,
+        "c_cutoff_const": 0.25,
+        "c_cutoff_range": (0.25, 0.35),
+    }),
+    ("analysis", AnalysisParams, {
+        "dG_cutoff": 0.2,
+        "native_contact_distance": 5.0,
+        "min_cluster_size_percolated": 30,
+        "transition_source": ("cce2_sigmoid", "cce2_spline"),
+        "neighbor_cutoff_unfolding": 5.0,
+        "aic_selection": False,
+        "unfolding_nuclei_types": None,
+    }),
+    ("output", OutputParams, {
+        "result_dir": "results",
+        "stbmap": False,
+        "netout": False,
+        "all_results": False,
+        "verbosity_level": 1,
+    }),
+]
+
+def _assert_schema(obj, expected: dict) -> None:
+    """Assert that obj has exactly the expected fields and values."""
+    # Field types are validated by the dataclasses themselves on construction
+    assert [f.name for f in dataclasses.fields(obj)] == list(expected)
+    for name, expected_value in expected.items():
+        value = getattr(obj, name)
+        assert value == expected_value, f"{name}: {value!r} != {expected_value!r}"
+        # The validator accepts ints for float fields, and -7 == -7.0, so
+        # check that float defaults (also inside tuples) really are floats
+        if isinstance(expected_value, (float, tuple)):
+            assert type(value) is type(expected_value), f"{name}: unexpected type {type(value)}"
+        if isinstance(expected_value, tuple):
+            assert [type(v) for v in value] == [type(v) for v in expected_value], \
+                f"{name}: unexpected item types"
+
+@pytest.mark.parametrize(
+    "attr, params_type, expected", DEFAULT_PARAMS, ids=[p[0] for p in DEFAULT_PARAMS]
+)
+def test_default_params(attr, params_type, expected):
+    """Verify the default fields and values of each parameter group."""
+    params = getattr(load_default_config(), attr)
+    assert type(params) is params_type
+    _assert_schema(params, expected)
+
+@pytest.mark.parametrize("make_params", [
+    lambda: SimulationParams(cores="2"),
+    lambda: SimulationParams(cores=True),
+    lambda: SimulationParams(cores=np.bool_(True)),
+    lambda: SimulationParams(cores=2.0),
+    lambda: SimulationParams(e_step="0.1"),
+    lambda: ConstraintParams(c_cutoff_range=(0.25,)),
+    lambda: AnalysisParams(transition_source=["cce2_sigmoid"]),
+    lambda: AnalysisParams(unfolding_nuclei_types=(1, "2")),
+    lambda: OutputParams(stbmap=1),
+    lambda: CNAConfig(output=None),
+])
+def test_params_reject_wrong_types(make_params):
+    """Verify that a field value of the wrong type is rejected on construction."""
+    with pytest.raises(TypeError, match="must be"):
+        make_params()
+
+def test_params_accept_compatible_types():
+    """Verify that ints and NumPy scalars are accepted and Optional fields take values."""
+    assert SimulationParams(e_stop=-7, e_step=0.5).e_stop == -7.0
+    assert AnalysisParams(unfolding_nuclei_types=(1, 2)).unfolding_nuclei_types == (1, 2)
+    # NumPy scalars (e.g., values read from arrays) are valid numbers too
+    assert SimulationParams(cores=np.int64(2), e_stop=np.float32(-7.0)).cores == 2
+    assert ConstraintParams(c_cutoff_range=(np.float64(0.2), 0.3)).c_cutoff_range == (0.2, 0.3)
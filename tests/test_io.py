@@ -1,21 +1,23 @@
 # File: tests/test_io.py
 # Content:
 
+import io
+import os
+import shutil
+import sys
+import numpy as np
 import pytest
 from pathlib import Path
-import biotite.structure as struc
-from biotite.structure.error import BadStructureError
+from unittest.mock import patch
+from biotite.structure import AtomArray
 from cna.io import readers
 import logging
 
+from .conftest import TEST_CIF_FILE, TEST_DATA_DIR, TEST_PDB_FILE
+
 # Setup logger for testing specific messages if needed
 logger = logging.getLogger(__name__)
 
-# Define the path to the test data directory relative to this test file
-TEST_DATA_DIR = Path(__file__).parent / "data"
-TEST_PDB_FILE = TEST_DATA_DIR / "01_simple_helix.pdb"
-TEST_CIF_FILE = TEST_DATA_DIR / "01_simple_helix.cif"
-
 # Define the expected number of atoms for the test files
 EXPECTED_ATOMS = 336
 
@@ -31,50 +33,50 @@ def check_test_files_exist():
             "Please ensure these files exist in the tests/data directory."
         )
 
-def test_load_pdb_structure_success():
+@pytest.mark.parametrize("fixture_name, file_format", [
+    ("loaded_atom_array_pdb", "PDB"),
+    ("loaded_atom_array_cif", "CIF"),
+])
+def test_load_structure_success(request, fixture_name, file_format):
     """
-    Tests successful loading of a standard PDB file (with H and caps) using load_structure.
+    Tests successful loading of standard PDB and mmCIF files (with H and caps) using load_structure.
+
+    The files are loaded once per session by the loaded_atom_array_* fixtures
+    (see conftest.py), which fail the test if load_structure raises.
     """
-    try:
-        atom_array = readers.load_structure(TEST_PDB_FILE)
-    except FileNotFoundError:
-        pytest.fail(f"Test PDB file failed to load: {TEST_PDB_FILE} not found.")
-    except (ValueError, BadStructureError) as e:
-        pytest.fail(f"Test PDB file failed to parse: {e}")
-    except Exception as e:
-         pytest.fail(f"An unexpected error occurred during PDB loading: {e}")
-
-    assert isinstance(atom_array, struc.AtomArray), \
-        "load_structure from PDB should return a biotite.AtomArray"
+    atom_array = request.getfixturevalue(fixture_name)
+
+    assert isinstance(atom_array, AtomArray), \
+        f"load_structure from {file_format} should return a biotite.AtomArray"
     assert len(atom_array) == EXPECTED_ATOMS, \
-        f"PDB: Expected {EXPECTED_ATOMS} atoms, but found {len(atom_array)}"
+        f"{file_format}: Expected {EXPECTED_ATOMS} atoms, but found {len(atom_array)}"
+    assert atom_array.coord.dtype == np.float32, f"{file_format}: Expected float32 coordinates"
+    assert atom_array.coord.flags.c_contiguous, f"{file_format}: Expected C-contiguous coordinates"
     # Add checks for presence of hydrogens and caps if needed (e.g., check element list)
-    assert "H" in atom_array.element, "Expected Hydrogens to be present in the loaded PDB"
-    assert "ACE" in atom_array.res_name, "Expected ACE cap to be present"
-    assert "NMA" in atom_array.res_name, "Expected NMA cap to be present"
+    assert "H" in atom_array.element, f"Expected Hydrogens to be present in the loaded {file_format}"
+    assert "ACE" in atom_array.res_name, f"Expected ACE cap to be present in loaded {file_format}"
+    assert "NMA" in atom_array.res_name, f"Expected NMA cap to be present in loaded {file_format}"
 
+def test_load_structure_from_file_object(test_pdb_bytes):
+    """
+    Tests loading a PDB structure from a binary file object.
+    """
+    stream = io.BytesIO(test_pdb_bytes)
+    atom_array = readers.load_structure(stream, file_format="pdb")
+
+    assert isinstance(atom_array, AtomArray)
+    assert len(atom_array) == EXPECTED_ATOMS
+    assert atom_array.coord.dtype == np.float32
+    # The caller's stream is not closed by the reader
+    assert not stream.closed
 
-def test_load_cif_structure_success():
+@pytest.mark.parametrize("file_format", [None, "gro"])
+def test_load_structure_from_file_object_needs_format(test_pdb_bytes, file_format):
     """
-    Tests successful loading of a standard mmCIF file (with H and caps) using load_structure.
+    Tests that file objects require one of the dedicated loaders' formats.
     """
-    try:
-        atom_array = readers.load_structure(TEST_CIF_FILE)
-    except FileNotFoundError:
-        pytest.fail(f"Test CIF file failed to load: {TEST_CIF_FILE} not found.")
-    except (ValueError, BadStructureError) as e:
-        pytest.fail(f"Test CIF file failed to parse: {e}")
-    except Exception as e:
-         pytest.fail(f"An unexpected error occurred during CIF loading: {e}")
-
-    assert isinstance(atom_array, struc.AtomArray), \
-        "load_structure from CIF should return a biotite.AtomArray"
-    assert len(atom_array) == EXPECTED_ATOMS, \
-        f"CIF: Expected {EXPECTED_ATOMS} atoms, but found {len(atom_array)}"
-     # Add checks for presence of hydrogens and caps if needed
-    assert "H" in atom_array.element, "Expected Hydrogens to be present in the loaded CIF"
-    assert "ACE" in atom_array.res_name, "Expected ACE cap to be present in loaded CIF"
-    assert "NMA" in atom_array.res_name, "Expected NMA cap to be present in loaded CIF"
+    with pytest.raises(ValueError, match="file_format|file objects"):
+        readers.load_structure(io.BytesIO(test_pdb_bytes), file_format=file_format)
 
 def test_load_structure_file_not_found():
     """
@@ -86,6 +88,111 @@ def test_load_structure_file_not_found():
     with pytest.raises(FileNotFoundError):
         readers.load_structure(non_existent_file)
 
+def test_load_pdb_multiple_models_uses_first(tmp_path, caplog):
+    """
+    Tests that only the first model of a multi-model PDB file is returned, with a warning.
+    """
+    # Wrap the atom records of the test file into two identical models
+    atom_lines = [
+        line for line in TEST_PDB_FILE.read_text().splitlines()
+        if line.startswith(("ATOM", "HETATM"))
+    ]
+    multi_model_file = tmp_path / "multi_model.pdb"
+    multi_model_file.write_text("\n".join(
+        ["MODEL        1", *atom_lines, "ENDMDL",
+         "MODEL        2", *atom_lines, "ENDMDL", "END"]
+    ) + "\n")
+
+    with caplog.at_level(logging.WARNING, logger=readers.__name__):
+        atom_array = readers.load_structure(multi_model_file)
+
+    assert isinstance(atom_array, AtomArray)
+    assert len(atom_array) == EXPECTED_ATOMS
+    assert "contains multiple models (2)" in caplog.text
+
+def _write_bcif_sibling(cif_file: Path, atom_array: AtomArray) -> Path:
+    """Writes atom_array as a BinaryCIF file next to cif_file."""
+    from biotite.structure.io import pdbx
+
+    bcif_file = pdbx.BinaryCIFFile()
+    pdbx.set_structure(bcif_file, atom_array)
+    bcif_path = cif_file.with_suffix(".bcif")
+    bcif_file.write(bcif_path)
+    return bcif_path
+
+def test_load_cif_prefers_bcif_sibling(tmp_path, caplog, loaded_atom_array_cif):
+    """
+    Tests that an up-to-date BinaryCIF sibling is read instead of the mmCIF file.
+    """
+    cif_file = tmp_path / "helix.cif"
+    shutil.copy(TEST_CIF_FILE, cif_file)
+    bcif_path = _write_bcif_sibling(cif_file, loaded_atom_array_cif)
+
+    with caplog.at_level(logging.INFO, logger=readers.__name__):
+        atom_array = readers.load_structure(cif_file)
+
+    assert len(atom_array) == EXPECTED_ATOMS
+    assert f"Using BinaryCIF file {bcif_path}" in caplog.text
+
+def test_load_cif_ignores_stale_bcif_sibling(tmp_path, caplog, loaded_atom_array_cif):
+    """
+    Tests that a BinaryCIF sibling older than the mmCIF file is ignored.
+    """
+    cif_file = tmp_path / "helix.cif"
+    shutil.copy(TEST_CIF_FILE, cif_file)
+    bcif_path = _write_bcif_sibling(cif_file, loaded_atom_array_cif)
+    cif_mtime = cif_file.stat().st_mtime
+    os.utime(bcif_path, (cif_mtime - 10, cif_mtime - 10))
+
+    with caplog.at_level(logging.INFO, logger=readers.__name__):
+        atom_array = readers.load_structure(cif_file)
+
+    assert len(atom_array) == EXPECTED_ATOMS
+    assert "Using BinaryCIF" not in caplog.text
+
+def test_load_large_bcif_uses_memory_map(tmp_path, monkeypatch, loaded_atom_array_cif):
+    """
+    Tests that BinaryCIF files above the size threshold are read via a memory map.
+    """
+    bcif_path = _write_bcif_sibling(tmp_path / "helix.cif", loaded_atom_array_cif)
+    monkeypatch.setattr(readers, "_MMAP_THRESHOLD_BYTES", 0)
+
+    with patch.object(
+        readers, "_read_binary_cif_mapped", wraps=readers._read_binary_cif_mapped
+    ) as mapped_reader:
+        atom_array = readers.load_structure(bcif_path)
+
+    mapped_reader.assert_called_once()
+    assert len(atom_array) == EXPECTED_ATOMS
+    assert "ACE" in atom_array.res_name
+
+def test_pdb_reader_falls_back_without_fastpdb(monkeypatch):
+    """
+    Tests that Biotite's PDBFile is used when fastpdb is not installed.
+    """
+    from biotite.structure.io.pdb import PDBFile
+
+    # A None entry in sys.modules makes 'import fastpdb' raise ImportError
+    monkeypatch.setitem(sys.modules, "fastpdb", None)
+    readers._pdb_file_class.cache_clear()
+    try:
+        assert readers._pdb_file_class() is PDBFile
+        assert len(readers.load_structure(TEST_PDB_FILE)) == EXPECTED_ATOMS
+    finally:
+        readers._pdb_file_class.cache_clear()
+
+def test_pdb_reader_uses_fastpdb_when_installed():
+    """
+    Tests that fastpdb is used if installed and parses like Biotite's PDBFile.
+    """
+    fastpdb = pytest.importorskip("fastpdb")
+    from biotite.structure.io.pdb import PDBFile
+
+    assert readers._pdb_file_class() is fastpdb.PDBFile
+    atom_array = readers.load_structure(TEST_PDB_FILE)
+    reference = PDBFile.read(str(TEST_PDB_FILE)).get_structure(model=1)
+    assert atom_array == reference
+
 # --- Future Test Cases (Placeholders) ---
 # To implement these, create corresponding files in tests/data/
 
@@ -139,19 +246,6 @@ def test_load_structure_file_not_found():
 #     # assert len(atom_array) == EXPECTED_ATOMS_WITH_COVALENT_LIGAND # Define this
 #     pass
 
-# @pytest.mark.skip(reason="Test file not yet created")
-# def test_load_pdb_multiple_models():
-#     """Tests loading a PDB with multiple models, expecting a warning and first model."""
-#     multi_model_file = TEST_DATA_DIR / "multi_model_protein.pdb" # Create this file
-#     if not multi_model_file.is_file():
-#          pytest.skip(f"Multi-model test file not found at {multi_model_file}")
-#
-#     with pytest.warns(UserWarning, match="multiple models"):
-#         atom_array = readers.load_structure(multi_model_file)
-#
-#     assert isinstance(atom_array, struc.AtomArray)
-#     assert len(atom_array) == EXPECTED_ATOMS_MODEL_1 # Define this
-
 # @pytest.mark.skip(reason="Test file not yet created")
 # def test_load_corrupt_file():
 #     """Tests loading a deliberately corrupted PDB/CIF file."""
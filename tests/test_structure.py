@@ -1,121 +1,234 @@
 # File: tests/test_structure.py
 # Content:
 
+import re
 import pytest
-from pathlib import Path
 import numpy as np
 import biotite.structure as struc
+from biotite.structure import AtomArray
 
-from cna.io import readers
 from cna.structure.system import MolecularSystem
 
-# Define the path to the test data directory relative to this test file
-TEST_DATA_DIR = Path(__file__).parent / "data"
-TEST_PDB_FILE = TEST_DATA_DIR / "01_simple_helix.pdb"
-TEST_CIF_FILE = TEST_DATA_DIR / "01_simple_helix.cif"
-
 # Use the correct expected atom count
 EXPECTED_ATOMS = 336
+# Native-byte-order dtypes are singletons, so dtypes can be checked by identity
+_F32 = np.dtype(np.float32)
+# Atom count in the MolecularSystem repr (the exact format is tested separately)
+_REPR_PATTERN = re.compile(r"<MolecularSystem \((\d+) atoms\)>")
 
-@pytest.fixture(scope="module")
-def loaded_atom_array_pdb() -> struc.AtomArray:
-    """
-    Pytest fixture to load the test PDB file once for all tests in this module.
-    """
-    try:
-        return readers.load_structure(TEST_PDB_FILE)
-    except Exception as e:
-        pytest.fail(f"Fixture failed to load test PDB {TEST_PDB_FILE}: {e}")
-
-@pytest.fixture(scope="module")
-def loaded_atom_array_cif() -> struc.AtomArray:
-    """
-    Pytest fixture to load the test CIF file once for all tests in this module.
-    """
-    try:
-        return readers.load_structure(TEST_CIF_FILE)
-    except Exception as e:
-        pytest.fail(f"Fixture failed to load test CIF {TEST_CIF_FILE}: {e}")
+# The loaded_atom_array_pdb/_cif fixtures are session-scoped and the
+# system_pdb/_cif fixtures module-scoped (see conftest.py)
 
+def _assert_shape(system: MolecularSystem, atom_array: AtomArray, n_atoms: int) -> None:
+    """Assert that system and atom_array both have n_atoms atoms."""
+    assert system.atom_count == n_atoms == len(atom_array), \
+        f"Expected {n_atoms} atoms, got atom_count {system.atom_count} " \
+        f"and AtomArray length {len(atom_array)}"
+    assert system.coords.shape == (n_atoms, 3), \
+        f"Expected coords shape ({n_atoms}, 3), got {system.coords.shape}"
 
 # --- Tests using PDB input ---
 
-def test_molecular_system_init_pdb(loaded_atom_array_pdb: struc.AtomArray):
+def test_molecular_system_init_pdb(
+    loaded_atom_array_pdb: AtomArray, system_pdb: MolecularSystem
+):
     """
     Tests the initialization of the MolecularSystem class using PDB data.
     """
-    assert isinstance(loaded_atom_array_pdb, struc.AtomArray), "PDB Fixture did not return AtomArray"
+    assert isinstance(loaded_atom_array_pdb, AtomArray), "PDB Fixture did not return AtomArray"
 
-    system = MolecularSystem(loaded_atom_array_pdb)
+    system = system_pdb
 
     assert isinstance(system, MolecularSystem), "Failed to initialize MolecularSystem from PDB"
     assert system._atom_array is loaded_atom_array_pdb, "Internal AtomArray (PDB) is not the same object"
     assert len(system) == EXPECTED_ATOMS, "Length via __len__ (PDB) is incorrect"
-    assert repr(system) == f"<MolecularSystem ({EXPECTED_ATOMS} atoms)>", "Repr (PDB) is incorrect"
+    match = _REPR_PATTERN.fullmatch(repr(system))
+    assert match and int(match.group(1)) == EXPECTED_ATOMS, "Repr (PDB) is incorrect"
+    assert not hasattr(system, "__dict__"), "MolecularSystem should use __slots__"
 
 
-def test_molecular_system_properties_pdb(loaded_atom_array_pdb: struc.AtomArray):
+def test_molecular_system_properties_pdb(
+    loaded_atom_array_pdb: AtomArray, system_pdb: MolecularSystem
+):
     """
     Tests the basic properties of the MolecularSystem class using PDB data.
     """
-    system = MolecularSystem(loaded_atom_array_pdb)
+    system = system_pdb
 
-    # Test atom_count property
-    assert system.atom_count == EXPECTED_ATOMS, \
-        f"PDB: Expected atom_count {EXPECTED_ATOMS}, got {system.atom_count}"
-    assert system.atom_count == len(loaded_atom_array_pdb), \
-        "PDB: atom_count does not match length of underlying AtomArray"
+    # Test atom_count property and coords shape
+    _assert_shape(system, loaded_atom_array_pdb, EXPECTED_ATOMS)
 
     # Test coords property
     assert isinstance(system.coords, np.ndarray), "PDB: coords property should return a NumPy array"
-    assert system.coords.shape == (EXPECTED_ATOMS, 3), \
-        f"PDB: Expected coords shape ({EXPECTED_ATOMS}, 3), got {system.coords.shape}"
-    assert system.coords.dtype == np.float32, \
+    assert system.coords.dtype is _F32, \
         "PDB: Expected coords dtype float32"
-    np.testing.assert_array_equal(system.coords, loaded_atom_array_pdb.coord,
-                                   err_msg="PDB: coords property does not match underlying AtomArray coordinates")
+    # load_structure() already yields contiguous float32 coordinates, so they
+    # are shared as is; an identity check avoids an O(N) comparison
+    assert system.coords is loaded_atom_array_pdb.coord, \
+        "PDB: coords property does not share the underlying AtomArray coordinates"
+
+    assert system.coords.flags.c_contiguous, "PDB: Expected C-contiguous coords"
 
     # Test atom_array property
     assert system.atom_array is loaded_atom_array_pdb, \
         "PDB: atom_array property does not return the correct underlying AtomArray object"
 
+def test_molecular_system_repr(system_pdb: MolecularSystem):
+    """
+    Tests the exact repr format of MolecularSystem.
+    """
+    assert repr(system_pdb) == f"<MolecularSystem ({EXPECTED_ATOMS} atoms)>"
+
+def test_molecular_system_coords_are_zero_copy(loaded_atom_array_pdb: AtomArray):
+    """
+    Tests that coords is the AtomArray's coordinate array, not a copy of it.
+    """
+    # Work on a copy, so the session-scoped fixture is left untouched
+    atom_array = loaded_atom_array_pdb.copy()
+    system = MolecularSystem(atom_array)
+
+    assert np.shares_memory(system.coords, atom_array.coord)
+    system.coords[0, 0] = 42.0
+    assert atom_array.coord[0, 0] == 42.0
+    assert system.soa["xyz"][0, 0] == 42.0
+
+def test_molecular_system_coords_soa_pdb(system_pdb: MolecularSystem):
+    """
+    Tests the (3, N) structure-of-arrays coordinate layout.
+    """
+    system = system_pdb
+    coords_soa = system.coords_soa
+
+    assert coords_soa.shape == (3, EXPECTED_ATOMS)
+    assert coords_soa.dtype is _F32
+    assert coords_soa.flags.c_contiguous
+    np.testing.assert_array_equal(coords_soa, system.coords.T)
+    # Computed once and cached
+    assert system.coords_soa is coords_soa
+
+def test_molecular_system_annotation_codes_pdb(
+    loaded_atom_array_pdb: AtomArray, system_pdb: MolecularSystem
+):
+    """
+    Tests that the integer-coded annotations match the string annotations.
+    """
+    system = system_pdb
+
+    assert system.element_codes.dtype == np.int8
+    assert system.name_codes.dtype == np.int16
+    assert system.res_ids.dtype == np.int32
+
+    for element in ("C", "N", "O", "H"):
+        np.testing.assert_array_equal(
+            system.element_codes == system.element_code(element),
+            loaded_atom_array_pdb.element == element,
+        )
+    np.testing.assert_array_equal(
+        system.name_codes == system.name_code("CA"),
+        loaded_atom_array_pdb.atom_name == "CA",
+    )
+    np.testing.assert_array_equal(system.res_ids, loaded_atom_array_pdb.res_id)
+
+    # Common elements have fixed codes shared between systems
+    assert system.element_code("C") == 0
+    assert system.element_code("H") == 4
+
+    # The packed arrays are the same objects as the individual accessors
+    assert system.soa["xyz"] is system.coords
+    assert system.soa["elem"] is system.element_codes
+    assert system.soa["res"] is system.res_ids
+    assert system.soa["name"] is system.name_codes
+    with pytest.raises(TypeError):
+        system.soa["xyz"] = None # type: ignore
+
+    # Unknown symbols map to -1 and therefore select no atoms
+    assert system.element_code("XX") == -1
+    assert not np.any(system.element_codes == system.element_code("XX"))
+    assert system.name_code("XX") == -1
+
+def test_molecular_system_unlisted_element_codes():
+    """
+    Tests that elements without a fixed code still get distinct codes.
+    """
+    atoms = [
+        struc.Atom([0.0, 0.0, 0.0], atom_name="C1", res_name="LIG", res_id=1, element="C"),
+        struc.Atom([1.0, 0.0, 0.0], atom_name="AU", res_name="AU", res_id=2, element="AU"),
+        struc.Atom([2.0, 0.0, 0.0], atom_name="PT", res_name="PT", res_id=3, element="PT"),
+    ]
+    system = MolecularSystem(struc.array(atoms))
+
+    codes = [system.element_code(e) for e in ("C", "AU", "PT")]
+    assert codes[0] == 0
+    assert len(set(codes)) == 3 and min(codes) >= 0
+    np.testing.assert_array_equal(system.element_codes, codes)
+
+def _array_with_annotation(category: str, values: np.ndarray) -> AtomArray:
+    """Build an AtomArray with one atom per value of the given annotation."""
+    atom_array = struc.AtomArray(len(values))
+    atom_array.set_annotation(category, values)
+    return atom_array
+
+@pytest.mark.parametrize("category, n_values, match", [
+    # 21 fixed element codes plus 107 unlisted elements fill int8 (0..127)
+    ("element", 107, None),
+    ("element", 108, "elements"),
+    ("atom_name", np.iinfo(np.int16).max + 1, None),
+    ("atom_name", np.iinfo(np.int16).max + 2, "atom names"),
+])
+def test_molecular_system_annotation_code_overflow(category, n_values, match):
+    """
+    Tests that annotations with more distinct values than codes are rejected.
+    """
+    if category == "element":
+        # Two-letter symbols that are not in the fixed element table
+        values = np.array([f"{chr(ord('A') + i // 10)}{i % 10}" for i in range(n_values)])
+    else:
+        values = np.array([f"N{i}" for i in range(n_values)])
+    atom_array = _array_with_annotation(category, values)
+
+    if match is None:
+        system = MolecularSystem(atom_array)
+        codes = system.element_codes if category == "element" else system.name_codes
+        assert len(np.unique(codes)) == n_values
+    else:
+        with pytest.raises(ValueError, match=match):
+            MolecularSystem(atom_array)
+
 # --- Tests using CIF input ---
 
-def test_molecular_system_init_cif(loaded_atom_array_cif: struc.AtomArray):
+def test_molecular_system_init_cif(
+    loaded_atom_array_cif: AtomArray, system_cif: MolecularSystem
+):
     """
     Tests the initialization of the MolecularSystem class using CIF data.
     """
-    assert isinstance(loaded_atom_array_cif, struc.AtomArray), "CIF Fixture did not return AtomArray"
+    assert isinstance(loaded_atom_array_cif, AtomArray), "CIF Fixture did not return AtomArray"
 
-    system = MolecularSystem(loaded_atom_array_cif)
+    system = system_cif
 
     assert isinstance(system, MolecularSystem), "Failed to initialize MolecularSystem from CIF"
     assert system._atom_array is loaded_atom_array_cif, "Internal AtomArray (CIF) is not the same object"
     assert len(system) == EXPECTED_ATOMS, "Length via __len__ (CIF) is incorrect"
-    assert repr(system) == f"<MolecularSystem ({EXPECTED_ATOMS} atoms)>", "Repr (CIF) is incorrect"
+    match = _REPR_PATTERN.fullmatch(repr(system))
+    assert match and int(match.group(1)) == EXPECTED_ATOMS, "Repr (CIF) is incorrect"
 
-def test_molecular_system_properties_cif(loaded_atom_array_cif: struc.AtomArray):
+def test_molecular_system_properties_cif(
+    loaded_atom_array_cif: AtomArray, system_cif: MolecularSystem
+):
     """
     Tests the basic properties of the MolecularSystem class using CIF data.
     """
-    system = MolecularSystem(loaded_atom_array_cif)
+    system = system_cif
 
-    # Test atom_count property
-    assert system.atom_count == EXPECTED_ATOMS, \
-        f"CIF: Expected atom_count {EXPECTED_ATOMS}, got {system.atom_count}"
-    assert system.atom_count == len(loaded_atom_array_cif), \
-        "CIF: atom_count does not match length of underlying AtomArray"
+    # Test atom_count property and coords shape
+    _assert_shape(system, loaded_atom_array_cif, EXPECTED_ATOMS)
 
     # Test coords property
     assert isinstance(system.coords, np.ndarray), "CIF: coords property should return a NumPy array"
-    assert system.coords.shape == (EXPECTED_ATOMS, 3), \
-        f"CIF: Expected coords shape ({EXPECTED_ATOMS}, 3), got {system.coords.shape}"
-    assert system.coords.dtype == np.float32, \
+    assert system.coords.dtype is _F32, \
         "CIF: Expected coords dtype float32"
-    # Compare coordinates between PDB and CIF loaded structures (should be almost identical)
-    pdb_coords = loaded_atom_array_cif.coord # Reuse CIF fixture for coords
-    np.testing.assert_allclose(system.coords, pdb_coords, atol=1e-3,
-                                err_msg="CIF: coords property does not match CIF AtomArray coordinates") # Use allclose due to potential float representation differences
+    assert system.coords is loaded_atom_array_cif.coord, \
+        "CIF: coords property does not share the underlying AtomArray coordinates"
 
     # Test atom_array property
     assert system.atom_array is loaded_atom_array_cif, \
@@ -124,20 +237,17 @@ def test_molecular_system_properties_cif(loaded_atom_array_cif: struc.AtomArray)
 
 # --- Error Handling Test ---
 
-def test_molecular_system_init_wrong_type():
+@pytest.mark.parametrize("bad_input", ["not an atom array", "dummy_stack"])
+def test_molecular_system_init_wrong_type(request, bad_input):
     """
     Tests that MolecularSystem raises TypeError if not initialized with AtomArray.
     """
-    with pytest.raises(TypeError):
-        MolecularSystem("not an atom array") # type: ignore
+    if bad_input == "dummy_stack":
+        # pytest has no built-in lazy fixtures in parametrize, so resolve it here
+        bad_input = request.getfixturevalue(bad_input)
 
-    with pytest.raises(TypeError):
-        # Create a dummy AtomArrayStack
-        atom1 = struc.Atom([1.0, 2.0, 3.0], atom_name="CA", res_name="ALA", res_id=1)
-        atom_array1 = struc.array([atom1])
-        atom_array2 = struc.array([atom1]) # Duplicate for stack
-        stack = struc.stack([atom_array1, atom_array2])
-        MolecularSystem(stack) # type: ignore
+    with pytest.raises(TypeError, match="AtomArray"):
+        MolecularSystem(bad_input) # type: ignore
 
 # --- Future Test Cases (Placeholders) ---
 # These would involve creating MolecularSystem instances from the future test files